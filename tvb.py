@@ -30,6 +30,7 @@ Options:
     -H               Hibernate after completion
     -P               Create preview (30 seconds)
     -d               Dry-run mode (show commands without execution)
+    --check-update   Check online for a newer HandBrakeCLI version
     -v               Verbose output
     --debug          Debug mode with detailed logging
     --version        Show version information
@@ -58,9 +59,15 @@ Examples:
     > Hibernate after completion
 '''
 
+import atexit
+import collections
 import os
 import sys
 import csv
+import functools
+import hashlib
+import json
+import threading
 import time
 import shlex
 import logging
@@ -70,12 +77,9 @@ import re
 import locale
 from pathlib import Path
 from datetime import datetime
-from pymediainfo import MediaInfo
-from tqdm import tqdm
 import configparser
-import requests
-from bs4 import BeautifulSoup
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Konfiguration laden
 config = configparser.ConfigParser()
@@ -83,10 +87,56 @@ config.read('tvb-config.ini')
 
 # Global settings
 terminal_columns, terminal_rows = shutil.get_terminal_size()
+# Platform dispatch computed once - sys.platform never changes at runtime
+_PLATFORM = sys.platform
+_IS_WIN = _PLATFORM.startswith('win32')
+_IS_MAC = _PLATFORM.startswith('darwin')
+_IS_LINUX = _PLATFORM.startswith('linux')
+_ENCODING = "cp775" if _IS_WIN else "utf-8"
 ENCODE_MOVIE = "movie"
 ENCODE_TVSHOW = "tvshow"
 ENCODE_CUSTOM = "custom"
+# One entry of TranscodeList.processed_list: source path plus target format.
+# Lighter than an ad-hoc tuple and gives readable attribute access.
+FormatJob = collections.namedtuple('FormatJob', 'path fmt')
 VIDEO_EXTENSIONS = {".mp4", ".mkv", ".avi", ".mov", ".flv", ".m4v", ".mpg", ".mpeg", ".wmv"}
+# Precomputed suffix tuple for fast, case-insensitive extension checks
+_EXT_TUPLE = tuple(e.lower() for e in VIDEO_EXTENSIONS)
+
+# Stat results collected during the directory scan, so later size/mtime
+# lookups on source files do not hit the filesystem again
+_stat_cache = {}
+
+def _walk_video_files(root):
+    """Yields video file paths below root using os.scandir.
+
+    scandir reuses the directory entry type from the kernel, so this needs
+    roughly one syscall per directory instead of one stat per file.
+    Unreadable directories are skipped, matching os.walk's default.
+    """
+    try:
+        it = os.scandir(root)
+    except OSError as e:
+        logging.debug(f"Skipping unreadable directory {root}: {e}")
+        return
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk_video_files(entry.path)
+            elif entry.is_file(follow_symlinks=False) and entry.name.lower().endswith(_EXT_TUPLE):
+                # the dirent type above is free; this stat is one lstat that
+                # later size/mtime lookups reuse via _stat_cache
+                _stat_cache[entry.path] = entry.stat(follow_symlinks=False)
+                yield entry.path
+
+def _cached_stat(path):
+    """Returns a cached os.stat_result for path, stat'ing at most once."""
+    path = os.fspath(path)
+    stat_result = _stat_cache.get(path)
+    if stat_result is None:
+        stat_result = os.stat(path)
+        _stat_cache[path] = stat_result
+    return stat_result
 LOG_FILE = "transcode.log"
 
 # Load config values
@@ -107,202 +157,219 @@ preserve_file_date = config.getboolean('default', 'preserve_file_date', fallback
 preserve_atmos_audio = config.getboolean('default', 'preserve_atmos_audio', fallback=False)
 # Localization setting for date format in statistics
 localization = config.get('default', 'localization', fallback='en_US')
+# Number of encodes to run in parallel (1 = sequential, the safe default)
+max_concurrent_encodes = config.getint('default', 'concurrent', fallback=1)
+# Encoder backend: 'handbrake' keeps the software encoders chosen by
+# transcode-video, 'nvenc' rewrites them to HandBrake's NVENC hardware encoders
+video_encoder_backend = config.get('default', 'encoder', fallback='handbrake').lower()
+
+# Software encoder -> NVENC hardware encoder mapping for HandBrakeCLI
+NVENC_ENCODER_MAP = {
+    'x264': 'nvenc_h264',
+    'x264_10bit': 'nvenc_h264',
+    'x265': 'nvenc_h265',
+    'x265_10bit': 'nvenc_h265_10bit',
+    'x265_12bit': 'nvenc_h265_10bit',
+    'vt_h264': 'nvenc_h264',
+    'vt_h265': 'nvenc_h265',
+    'vt_h265_10bit': 'nvenc_h265_10bit',
+    'svt_av1': 'nvenc_av1',
+    'svt_av1_10bit': 'nvenc_av1_10bit',
+}
 
-def find_tool_in_path(tool_name, config_section=None, config_key=None):
-    """Searches for a tool in PATH and uses config as fallback."""
-    # Typical paths for different platforms
-    typical_paths = {
-        'darwin': [  # macOS
-            '/opt/homebrew/bin',
-            '/usr/local/bin',
-            '/usr/bin',
-            '/opt/homebrew/opt/ruby/bin',
-            '/usr/local/opt/ruby/bin'
-        ],
-        'win32': [   # Windows
-            'C:\\bin',
-            'C:\\Program Files\\HandBrake',
-            'C:\\Ruby26-x64\\bin',
-            'C:\\Ruby25-x64\\bin'
-        ],
-        'linux': [   # Linux
-            '/usr/bin',
-            '/usr/local/bin',
-            '/opt/bin',
-            '/snap/bin'
-        ]
-    }
-    
-    # Search in PATH
-    if shutil.which(tool_name):
-        found_path = shutil.which(tool_name)
-        logging.debug(f"Tool '{tool_name}' found in PATH: {found_path}")
-        return found_path
-    
-    # Search in typical paths
-    platform_paths = typical_paths.get(sys.platform, [])
-    for path in platform_paths:
-        full_path = os.path.join(path, tool_name)
-        if os.path.exists(full_path) and os.access(full_path, os.X_OK):
-            logging.debug(f"Tool '{tool_name}' found in typical path: {full_path}")
-            return full_path
-    
-    # Fallback: Config value
-    if config_section and config_key and config_section in config and config_key in config[config_section]:
-        config_path = config[config_section][config_key]
-        logging.debug(f"Tool '{tool_name}' used from config: {config_path}")
-        return config_path
-    
-    # Last fallback: Tool name
-    logging.warning(f"Tool '{tool_name}' not found, using name: {tool_name}")
-    return tool_name
-
-def find_transcode_video():
-    """Searches for transcode-video in typical paths."""
-    # Typical paths for transcode-video
-    typical_paths = {
-        'darwin': [
-            #'/usr/local/bin/transcode-video.rb.',  # Priority 1: System installation (with dot)
-            '/usr/local/bin/transcode-video.rb',   # Priority 2: Without dot
-            '/usr/local/bin/transcode-video',      # Priority 3: Executable
-            '/opt/homebrew/bin/transcode-video.rb',
-            '/opt/homebrew/bin/transcode-video',
-            '/usr/bin/transcode-video.rb',
-            '/usr/bin/transcode-video',
-            #'/Users/stephan/SynologyDrive/Code/video_transcoding/transcode-video.rb'  # Fallback
-        ],
-        'win32': [
-            'C:\\Ruby26-x64\\bin\\transcode-video.bat',
-            'C:\\Ruby25-x64\\bin\\transcode-video.bat',
-            'C:\\bin\\transcode-video.bat'
-        ],
-        'linux': [
-            '/usr/local/bin/transcode-video.rb',
-            '/usr/local/bin/transcode-video',
-            '/usr/bin/transcode-video.rb',
-            '/usr/bin/transcode-video',
-            '/opt/bin/transcode-video.rb',
-            '/opt/bin/transcode-video'
-        ]
-    }
-    
-    # Search in typical paths
-    platform_paths = typical_paths.get(sys.platform, [])
-    for path in platform_paths:
-        if os.path.exists(path):
-            if path.endswith('.rb'):
-                # Ruby script found
-                ruby_path = shutil.which('ruby') or '/usr/bin/ruby'
-                full_command = f"{ruby_path} {path}"
-                logging.debug(f"transcode-video Ruby script found: {full_command}")
-                return full_command
-            else:
-                # Executable found
-                logging.debug(f"transcode-video executable found: {path}")
-                return path
-    
-    # Fallback: Config value
-    if 'transcode_video_path' in config and sys.platform in config['transcode_video_path']:
-        config_path = config['transcode_video_path'][sys.platform]
-        logging.debug(f"transcode-video used from config: {config_path}")
-        return config_path
-    
-    # Last fallback
-    logging.warning("transcode-video not found, using default path")
-    return "/usr/bin/ruby /path/to/transcode-video.rb"
+# Precompiled patterns for filename format detection, HandBrakeCLI command
+# rewriting and version parsing - compiled once instead of per call
+_TVSHOW_RE = re.compile(r"(.*?)[.\s][sS](\d{1,2})[eE](\d{1,3}).*")
+_AENC_RE = re.compile(r'--aencoder\s+([^-\s]+)')
+_AB_RE = re.compile(r'--ab\s+([^-\s]+)')
+_MIX_RE = re.compile(r'--mixdown\s+([^-\s]+)')
+_VERSION_RE = re.compile(r"(\d+\.\d+\.\d+)")
+_LATEST_VERSION_RE = re.compile(r"Current Version[^0-9]*(\d+\.\d+\.\d+)")
+# HandBrake progress lines, matched against every line of encoder output.
+# No leading .* - search() scans anyway, and non-progress lines are
+# rejected by a cheap substring test before the regex even runs
+_HB_PROGRESS_RE = re.compile(r'\s(\d+\.\d+)\s%.*avg\s(\d+\.\d+).*ETA\s(\d+)h(\d+)m(\d+)s')
+
+# Dolby Atmos markers in audio stream metadata: 'atmos' in any variant
+# spelling, or JOC (Joint Object Coding, the E-AC-3 Atmos carrier)
+_ATMOS_RE = re.compile(r'atmos|joc|joint[- ]object[- ]coding')
+
+# Typical installation locations per platform, shared by all tool lookups
+TYPICAL_PATHS = {
+    'darwin': [  # macOS
+        '/opt/homebrew/bin',
+        '/usr/local/bin',
+        '/usr/bin',
+        '/opt/homebrew/opt/ruby/bin',
+        '/usr/local/opt/ruby/bin'
+    ],
+    'win32': [   # Windows
+        'C:\\bin',
+        'C:\\Program Files\\HandBrake',
+        'C:\\Ruby26-x64\\bin',
+        'C:\\Ruby25-x64\\bin'
+    ],
+    'linux': [   # Linux
+        '/usr/bin',
+        '/usr/local/bin',
+        '/opt/bin',
+        '/snap/bin'
+    ]
+}
 
-def find_tool_path(tool_name, config_section=None):
-    """Intelligente Tool-Suche: PATH -> typische Pfade -> Config"""
-    
+@functools.lru_cache(maxsize=None)
+def resolve_tool(name, ruby_wrap=False, config_section=None, config_key=None):
+    """Resolves an external tool: PATH -> typical locations -> config.
+
+    With ruby_wrap=True the lookup also tries '<name>.rb' ('<name>.bat' on
+    Windows) and returns a found Ruby script as '<ruby> <script>'.
+    """
     # 1. Suche im PATH
-    path_result = shutil.which(tool_name)
+    path_result = shutil.which(name)
     if path_result:
+        logging.debug(f"Tool '{name}' found in PATH: {path_result}")
         return path_result
-    
-    # 2. Typische Pfade für verschiedene Plattformen
-    typical_paths = {
-        'darwin': [  # macOS
-            '/opt/homebrew/bin',
-            '/usr/local/bin',
-            '/usr/bin',
-            '/opt/homebrew/opt/ruby/bin',
-            '/usr/local/opt/ruby/bin'
-        ],
-        'win32': [   # Windows
-            'C:\\bin',
-            'C:\\Program Files\\HandBrake',
-            'C:\\Ruby26-x64\\bin',
-            'C:\\Ruby25-x64\\bin'
-        ],
-        'linux': [   # Linux
-            '/usr/bin',
-            '/usr/local/bin',
-            '/opt/bin',
-            '/snap/bin'
-        ]
-    }
-    
-    platform_paths = typical_paths.get(sys.platform, [])
-    for path in platform_paths:
-        full_path = os.path.join(path, tool_name)
-        if os.path.exists(full_path) and os.access(full_path, os.X_OK):
-            return full_path
-    
-    # 3. Config-Wert als Fallback
-    if config_section and config_section in config and sys.platform in config[config_section]:
-        return config[config_section][sys.platform]
-    
-    # Wenn nichts gefunden wurde, verwende den Tool-Namen (wird wahrscheinlich im PATH gefunden)
-    return tool_name
 
-def find_transcode_video_path():
-    """Spezielle Suche für transcode-video mit Ruby-Integration"""
-    
-    # Typische Pfade für transcode-video
-    typical_paths = {
-        'darwin': [
-            '/usr/local/bin/transcode-video.rb',
-            '/usr/local/bin/transcode-video',
-            '/opt/homebrew/bin/transcode-video.rb',
-            '/opt/homebrew/bin/transcode-video',
-            '/usr/bin/transcode-video.rb',
-            '/usr/bin/transcode-video'
-        ],
-        'win32': [
-            'C:\\Ruby26-x64\\bin\\transcode-video.bat',
-            'C:\\Ruby25-x64\\bin\\transcode-video.bat'
-        ],
-        'linux': [
-            '/usr/local/bin/transcode-video.rb',
-            '/usr/local/bin/transcode-video',
-            '/usr/bin/transcode-video.rb',
-            '/usr/bin/transcode-video'
-        ]
-    }
-    
-    # Suche in typischen Pfaden
-    platform_paths = typical_paths.get(sys.platform, [])
-    for path in platform_paths:
-        if os.path.exists(path):
-            if path.endswith('.rb'):
+    # 2. Typische Pfade für verschiedene Plattformen
+    if ruby_wrap:
+        suffixes = ('.bat',) if sys.platform == 'win32' else ('.rb', '')
+    else:
+        suffixes = ('',)
+
+    for directory in TYPICAL_PATHS.get(sys.platform, []):
+        for suffix in suffixes:
+            candidate = os.path.join(directory, name + suffix)
+            if not os.path.exists(candidate):
+                continue
+            if suffix == '.rb':
                 # Ruby-Skript gefunden - finde Ruby und kombiniere
                 ruby_path = shutil.which('ruby') or '/usr/bin/ruby'
-                return f"{ruby_path} {path}"
-            else:
-                # Executable gefunden
-                return path
-    
-    # Config-Fallback
-    if 'transcode_video_path' in config and sys.platform in config['transcode_video_path']:
-        return config['transcode_video_path'][sys.platform]
-    
-    # Letzter Fallback
-    return "/usr/bin/ruby /usr/local/bin/transcode-video.rb"
+                full_command = f"{ruby_path} {candidate}"
+                logging.debug(f"Tool '{name}' Ruby script found: {full_command}")
+                return full_command
+            if os.access(candidate, os.X_OK):
+                logging.debug(f"Tool '{name}' found in typical path: {candidate}")
+                return candidate
+
+    # 3. Config-Wert als Fallback
+    if config_section and config_section in config:
+        section = config[config_section]
+        key = config_key or sys.platform
+        if key in section:
+            logging.debug(f"Tool '{name}' used from config: {section[key]}")
+            return section[key]
+
+    # Wenn nichts gefunden wurde, verwende den Tool-Namen
+    logging.warning(f"Tool '{name}' not found, using name: {name}")
+    return name
+
+# Discovered tool paths are persisted between runs, keyed by platform and
+# PATH, so repeated invocations skip the filesystem probing entirely
+_TOOL_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'tvb', 'tool_paths.json')
+
+def _tool_cache_key():
+    digest = hashlib.blake2b(os.environ.get('PATH', '').encode()).hexdigest()
+    return f'{sys.platform}:{digest}'
+
+def _binary_of(tool_path):
+    """Returns the stat'able part of a tool path.
+
+    Only ruby-wrapped commands ('<ruby> <script>.rb') carry a prefix; plain
+    paths may legitimately contain spaces and are returned untouched.
+    """
+    if tool_path.endswith('.rb') and ' ' in tool_path:
+        return tool_path.split(' ', 1)[1]
+    return tool_path
+
+def _load_tool_cache():
+    """Loads previously discovered tool paths, if they are still valid."""
+    try:
+        with open(_TOOL_CACHE_FILE, 'r', encoding='utf-8') as cache_file:
+            cache = json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+
+    entry = cache.get(_tool_cache_key())
+    if not entry:
+        return None
+
+    # Invalidate when a discovered binary changed or disappeared; entries
+    # without an mtime (bare-name fallbacks) have nothing to verify
+    for tool_path, mtime in entry.values():
+        if not mtime:
+            continue
+        try:
+            if os.stat(_binary_of(tool_path)).st_mtime != mtime:
+                return None
+        except OSError:
+            return None
+
+    return {tool: tool_path for tool, (tool_path, _) in entry.items()}
+
+def _save_tool_cache(paths):
+    """Persists the discovered tool paths for the next invocation."""
+    entry = {}
+    for tool, tool_path in paths.items():
+        try:
+            mtime = os.stat(_binary_of(tool_path)).st_mtime
+        except OSError:
+            mtime = 0
+        entry[tool] = [tool_path, mtime]
+
+    try:
+        # Merge into the existing document so entries for other
+        # platform/PATH keys survive
+        try:
+            with open(_TOOL_CACHE_FILE, 'r', encoding='utf-8') as cache_file:
+                cache = json.load(cache_file)
+        except (OSError, ValueError):
+            cache = {}
+        if not isinstance(cache, dict):
+            cache = {}
+        cache[_tool_cache_key()] = entry
+
+        os.makedirs(os.path.dirname(_TOOL_CACHE_FILE), exist_ok=True)
+        with open(_TOOL_CACHE_FILE, 'w', encoding='utf-8') as cache_file:
+            json.dump(cache, cache_file)
+    except OSError:
+        pass
+
+_REQUIRED_TOOLS = frozenset({'transcode-video', 'mkvpropedit', 'mkvmerge', 'ffprobe'})
+
+def _discover_tools():
+    """Resolves all external tool paths, using the on-disk cache when valid."""
+    cached = _load_tool_cache()
+    if cached is not None and set(cached) >= _REQUIRED_TOOLS:
+        return cached
+
+    # Each lookup is syscall-bound (stat/access on a handful of paths), so
+    # the cold case runs the three discoveries concurrently
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = {
+            'transcode-video': executor.submit(resolve_tool, 'transcode-video',
+                                               ruby_wrap=True, config_section='transcode_video_path'),
+            'mkvpropedit': executor.submit(resolve_tool, 'mkvpropedit', config_section='mkvpropedit_path'),
+            'mkvmerge': executor.submit(resolve_tool, 'mkvmerge', config_section='mkvmerge_path'),
+            'ffprobe': executor.submit(resolve_tool, 'ffprobe', config_section='ffprobe_path'),
+        }
+        paths = {tool: future.result() for tool, future in futures.items()}
+
+    _save_tool_cache(paths)
+    return paths
 
 # Tool-Pfade intelligent finden
-transcode_video_path = find_transcode_video_path()
-path_mkvpropedit = find_tool_path('mkvpropedit', 'mkvpropedit_path')
-path_mkvmerge = find_tool_path('mkvmerge', 'mkvmerge_path')
+_tool_paths = _discover_tools()
+transcode_video_path = _tool_paths['transcode-video']
+path_mkvpropedit = _tool_paths['mkvpropedit']
+path_mkvmerge = _tool_paths['mkvmerge']
+path_ffprobe = _tool_paths['ffprobe']
+
+# Tokenize the per-format transcode-video argv prefixes once at import time;
+# the config never changes during a batch, so per-file shlex runs are wasted
+_PREBUILT_CMD = {
+    encode_type: [*shlex.split(transcode_video_path), *shlex.split(params), '--dry-run']
+    for encode_type, params in encoding_parameters.items()
+}
 
 class AttrDict(dict):
     """Dictionary with attribute access."""
@@ -315,6 +382,8 @@ class Filesize(object):
     chunk = 1024
     units = ['bytes', 'KB', 'MB', 'GB', 'TB', 'PB']
     precisions = [0, 0, 1, 2, 2, 2]
+    # Bit shifts per unit (1024**n == 1 << 10*n), avoids float pow/log
+    _shifts = [i * 10 for i in range(len(units))]
 
     def __init__(self, size):
         self.size = size
@@ -325,9 +394,10 @@ class Filesize(object):
     def __str__(self):
         if self.size == 0:
             return '0 bytes'
-        from math import log
-        unit = self.units[min(int(log(self.size, self.chunk)), len(self.units) - 1)]
-        return self.format(unit)
+        # bit_length arithmetic is exact at power-of-1024 boundaries,
+        # unlike the previous float log
+        exponent = min((self.size.bit_length() - 1) // 10, len(self.units) - 1)
+        return self.format(self.units[exponent])
 
     def format(self, unit):
         if unit not in self.units:
@@ -335,7 +405,7 @@ class Filesize(object):
         if self.size == 1 and unit == 'bytes':
             return '1 byte'
         exponent = self.units.index(unit)
-        quotient = float(self.size) / self.chunk**exponent
+        quotient = self.size / (1 << self._shifts[exponent])
         precision = self.precisions[exponent]
         format_string = '{:.%sf} {}' % (precision)
         return format_string.format(quotient, unit)
@@ -357,11 +427,7 @@ class TranscodeList(object):
         video_files = []
 
         if os.path.isdir(self.input_directory) and os.path.exists(self.input_directory):
-            for root, _, files in os.walk(self.input_directory):
-                for file in files:
-                    _, ext = os.path.splitext(file)
-                    if ext.lower() in VIDEO_EXTENSIONS:
-                        video_files.append(os.path.join(root, file))
+            video_files.extend(_walk_video_files(self.input_directory))
         elif os.path.isfile(self.input_directory) and os.path.exists(self.input_directory):
             _, ext = os.path.splitext(self.input_directory)
             if ext.lower() in VIDEO_EXTENSIONS:
@@ -375,27 +441,23 @@ class TranscodeList(object):
 
     def _detect_formats(self):
         """Automatically detects format based on filename."""
-        format_list = []
-        for file_path in self.file_list:
-            m = re.match(r"(.*?)[.\s][sS](\d{1,2})[eE](\d{1,3}).*", os.path.basename(file_path))
-            match = re.search(r"(.*?)[.\s][sS](\d{1,2})[eE](\d{1,3}).*", os.path.basename(file_path))
-            if match:
+        format_list = [None] * len(self.file_list)
+        for i, file_path in enumerate(self.file_list):
+            m = _TVSHOW_RE.match(os.path.basename(file_path))
+            if m:
                 logging.debug("%s is a TV-Show." % os.path.basename(file_path))
-                format_list.append((file_path, "tvshow"))
+                format_list[i] = FormatJob(file_path, ENCODE_TVSHOW)
                 logging.debug("TV-Show name: %s" % m.group(1))
                 logging.debug("TV-Show series number: %s" % m.group(2))
                 logging.debug("TV-Show episode: %s" % m.group(3))
             else:
                 logging.debug("%s is not a TV-Show." % os.path.basename(file_path))
-                format_list.append((file_path, "movie"))
+                format_list[i] = FormatJob(file_path, ENCODE_MOVIE)
         return format_list
 
     def _apply_forced_format(self):
         """Uses the specified format for all files."""
-        format_list = []
-        for file_path in self.file_list:
-            format_list.append((file_path, self.forced_format))
-        return format_list
+        return [FormatJob(file_path, self.forced_format) for file_path in self.file_list]
 
 # Setup logging
 def setup_logging(verbose=False, debug=False):
@@ -429,76 +491,168 @@ def setup_logging(verbose=False, debug=False):
     logging.debug("Logging system initialized")
     logging.info("TVB logging started")
 
+_locale_initialized = False
+
+def _init_locale_once():
+    """Sets up the configured locale for date formatting, once per run.
+
+    The chosen locale never changes during a batch, so this runs from
+    main() instead of once per encoded file.
+    """
+    global _locale_initialized
+    if _locale_initialized:
+        return
+    _locale_initialized = True
+
+    # Set locale based on configuration
+    # Try to use the configured locale, fallback to system default if not available
+    # localization is a module-level config constant, so read it directly
+    locale_set = False
+    loc_setting = localization if localization and localization.lower() != 'default' else None
+
+    if loc_setting:
+        # Try different variations of the locale string
+        locale_variations = [
+            loc_setting,
+            f"{loc_setting}.UTF-8",
+            f"{loc_setting}.utf8",
+            loc_setting.replace('-', '_'),
+            f"{loc_setting.replace('-', '_')}.UTF-8"
+        ]
+
+        for loc in locale_variations:
+            try:
+                locale.setlocale(locale.LC_ALL, loc)
+                logging.debug(f"Successfully set locale to: {loc}")
+                locale_set = True
+                break
+            except locale.Error:
+                continue
+
+        if not locale_set:
+            logging.debug(f"Locale '{loc_setting}' not available, using system default")
+            locale.setlocale(locale.LC_ALL, '')
+    else:
+        locale.setlocale(locale.LC_ALL, '')
+
 def get_platform_encoding():
     """Returns the correct encoding setting for different platforms."""
-    return "cp775" if sys.platform.startswith("win32") else "utf-8"
+    return _ENCODING
 
-def get_media_info(input_file):
-    """Extracts media information using pymediainfo."""
-    media_info = MediaInfo.parse(input_file)
-    general_track = next((t for t in media_info.tracks if t.track_type == "General"), None)
-    subtitle_tracks = [t for t in media_info.tracks if t.track_type == "Text"]
+@functools.lru_cache(maxsize=1024)
+def probe(path):
+    """Probes a file with ffprobe at most once per batch, returning the JSON document."""
+    output = subprocess.check_output(
+        [path_ffprobe, '-v', 'error', '-show_streams', '-show_format', '-of', 'json', str(path)])
+    return json.loads(output)
 
-    if not general_track:
-        logging.debug("No general track information found.")
+def get_media_info(input_file):
+    """Extracts subtitle stream information using ffprobe."""
+    try:
+        info = probe(input_file)
+    except (subprocess.CalledProcessError, OSError, ValueError) as e:
+        logging.debug(f"ffprobe failed for {input_file}: {e}")
         return []
 
-    logging.info(f"File size: {general_track.file_size}")
-    logging.info(f"Number of subtitles: {general_track.count_of_text_streams}")
+    subtitle_streams = [s for s in info.get('streams', []) if s.get('codec_type') == 'subtitle']
+
+    logging.info(f"File size: {info.get('format', {}).get('size')}")
+    logging.info(f"Number of subtitles: {len(subtitle_streams)}")
 
-    return [(t.title or "", int(t.default == "Yes"), int(t.forced == "Yes")) for t in subtitle_tracks]
+    return [(s.get('tags', {}).get('title', '') or '',
+             int(s.get('disposition', {}).get('default', 0)),
+             int(s.get('disposition', {}).get('forced', 0)))
+            for s in subtitle_streams]
 
 def edit_subtitles(output_file, subtitles):
     """Edits subtitles using `mkvpropedit`."""
-    cmd = f'{path_mkvpropedit} "{output_file}" --edit info --set "title=\'\'" '
-    
-    for i, (subtitle_title, subtitle_default, subtitle_forced) in enumerate(subtitles, 1):
-        cmd += f'--edit track:s{i} --set "name={subtitle_title}" --set flag-default={subtitle_default} --set flag-forced={subtitle_forced} '
+    # Build the argv directly - no shell quoting, so titles containing
+    # quotes or backslashes cannot break the command
+    args = [path_mkvpropedit, str(output_file), '--edit', 'info', '--set', "title=''"]
 
-    logging.debug(f"mkvpropedit command: {cmd}")
-    subprocess.run(shlex.split(cmd))
+    for i, (subtitle_title, subtitle_default, subtitle_forced) in enumerate(subtitles, 1):
+        args += ['--edit', f'track:s{i}',
+                 '--set', f'name={subtitle_title}',
+                 '--set', f'flag-default={subtitle_default}',
+                 '--set', f'flag-forced={subtitle_forced}']
+
+    logging.debug(f"mkvpropedit command: {args}")
+    subprocess.run(args, check=False)
+
+class StatsWriter(object):
+    """Appends transcoding statistics to a CSV file through one open handle.
+
+    The file is opened once per batch instead of per row; rows are flushed
+    immediately so an aborted batch still keeps everything written so far.
+    """
+    HEADER = ['Encoded Date', 'Filename', 'Original Size', 'New Size', 'Percentage', 'Duration of Encode', 'Command']
+
+    def __init__(self, path):
+        self._file = open(path, 'a', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file, delimiter=';', quotechar='"', quoting=csv.QUOTE_MINIMAL)
+        self._lock = threading.Lock()  # workers may report concurrently
+        if self._file.tell() == 0:
+            logging.debug('Stats file is empty, writing header')
+            self._writer.writerow(self.HEADER)
+        atexit.register(self.close)
+
+    def writerow(self, statistics_data):
+        with self._lock:
+            self._writer.writerow(statistics_data)
+            self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+_stats_writer = None
+_stats_writer_lock = threading.Lock()
 
 def write_statistics(statistics_data):
-    """Writes transcoding statistics to a CSV file."""
-    stats_filename = 'tvb-stats.csv'
-    delimiter = ';'
-    header = ['Encoded Date', 'Filename', 'Original Size', 'New Size', 'Percentage', 'Duration of Encode', 'Command']
-    
-    if os.path.exists(stats_filename):
-        logging.debug('Stats file exists, appending data')
-        with open(stats_filename, 'a', newline='', encoding='utf-8') as stats_file:
-            writer = csv.writer(stats_file, delimiter=delimiter, quotechar='"', quoting=csv.QUOTE_MINIMAL)
-            writer.writerow(statistics_data)
-    else:
-        logging.debug('Stats file does not exist, creating file, writing header and data')
-        with open(stats_filename, mode='w', newline='', encoding='utf-8') as stats_file:
-            writer = csv.writer(stats_file, delimiter=delimiter, quotechar='"', quoting=csv.QUOTE_MINIMAL)
-            writer.writerow(header)
-            writer.writerow(statistics_data)
+    """Writes transcoding statistics to the shared CSV writer."""
+    global _stats_writer
+    with _stats_writer_lock:
+        if _stats_writer is None:
+            _stats_writer = StatsWriter('tvb-stats.csv')
+    _stats_writer.writerow(statistics_data)
 
 def set_target_date(source, target):
     """Setzt das Änderungsdatum der Datei."""
-    old_date = os.path.getmtime(source)
+    old_date = _cached_stat(source).st_mtime
     os.utime(target, (old_date, old_date))
 
+def _hibernate_win():
+    logging.debug('windows plattform detected, hibernating...')
+    os.system(r'%windir%\system32\rundll32.exe powrprof.dll,SetSuspendState Hibernate')
+
+def _hibernate_mac():
+    logging.debug('mac os plattform detected, hibernating...')
+    args = ['pmset', 'sleepnow']
+    logging.debug('Execute commands: %s' % args)
+    subprocess.Popen(args, bufsize=1, stdout=subprocess.PIPE, universal_newlines=True)
+
+def _hibernate_linux():
+    logging.debug('linux platform detected, hibernating...')
+
+def _hibernate_bsd():
+    logging.debug('freebsd plattform detected, hibernating...')
+
+# Resolved once instead of walking the startswith chain per call
+if _IS_WIN:
+    _HIBERNATE = _hibernate_win
+elif _IS_MAC:
+    _HIBERNATE = _hibernate_mac
+elif _IS_LINUX:
+    _HIBERNATE = _hibernate_linux
+elif _PLATFORM.startswith('freebsd'):
+    _HIBERNATE = _hibernate_bsd
+else:
+    _HIBERNATE = None
+
 def hibernate(hibernate_tag=None):
     """Hiberniert den Computer nach der Transkodierung."""
-    if not hibernate_tag:
-        return
-        
-    if sys.platform.startswith('freebsd'):
-        logging.debug('freebsd plattform detected, hibernating...')
-    elif sys.platform.startswith('linux'):
-        logging.debug('linux platform detected, hibernating...')
-    elif sys.platform.startswith('win32'):
-        logging.debug('windows plattform detected, hibernating...')
-        os.system(r'%windir%\system32\rundll32.exe powrprof.dll,SetSuspendState Hibernate')
-    elif sys.platform.startswith('darwin'):
-        logging.debug('mac os plattform detected, hibernating...')
-        cmd = "pmset sleepnow"
-        args = shlex.split(cmd)
-        logging.debug('Execute commands: %s' % args)
-        subprocess.Popen(args, bufsize=1, stdout=subprocess.PIPE, universal_newlines=True)
+    if hibernate_tag and _HIBERNATE:
+        _HIBERNATE()
 
 def merge_file(input_file, output_dir):
     """Multiplexiert eine Datei mit mkvmerge."""
@@ -510,77 +664,62 @@ def merge_file(input_file, output_dir):
 
     logging.info(f'Multiplexing: {Path(input_file).name}')
     
-    cmd = f'{path_mkvmerge} -o "{output_file}" "{input_file}"'
-    args = shlex.split(cmd)
-    
-    logging.debug(f"mkvmerge command: {cmd}")
-    result = subprocess.run(args, capture_output=True, text=True, encoding=get_platform_encoding())
-    
-    if result.returncode == 0:
+    args = [path_mkvmerge, '-o', str(output_file), str(input_file)]
+    logging.debug(f"mkvmerge command: {args}")
+
+    # Stream the output line by line instead of buffering it all in memory;
+    # errors surface immediately and memory use stays flat on long merges
+    with subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          text=True, encoding=get_platform_encoding(), bufsize=1) as proc:
+        for line in proc.stdout:
+            line = line.rstrip()
+            if not line:
+                continue
+            if line.startswith(('Error', 'Warning')):
+                logging.error(f'mkvmerge: {line}')
+            else:
+                logging.debug(f'mkvmerge: {line}')
+        returncode = proc.wait()
+
+    if returncode == 0:
         logging.info(f'Successfully multiplexed: {Path(input_file).name}')
         if preserve_file_date:
             set_target_date(input_file, output_file)
     else:
         logging.error(f'Failed to multiplex: {Path(input_file).name}')
-        logging.error(f'Error: {result.stderr}')
 
 def modify_handbrake_output_path(handbrake_cmd, output_file, preview=False, atmos_tracks=None):
     """Modifies the HandBrakeCLI command to set the correct output path, add preview if requested, and preserve Dolby Atmos."""
-    import re
-
-    # Step 1: Extract the original output filename from the command
-    # Find everything between --output and the next parameter (which starts with --)
-    output_match = re.search(r'--output\s+(.+?)(?=\s--|$)', handbrake_cmd)
-
-    if not output_match:
+    # Tokenize the command once and edit the argv in place - a single pass
+    # instead of repeated full-string regex scans and rebuilds
+    argv = shlex.split(handbrake_cmd)
+    flag_idx = {arg: i for i, arg in enumerate(argv) if arg.startswith('--')}
+
+    # Step 1: Replace the output parameter
+    output_idx = flag_idx.get('--output')
+    if output_idx is None or output_idx + 1 >= len(argv):
         logging.warning("Could not find --output parameter in HandBrakeCLI command")
         return handbrake_cmd
 
-    original_output = output_match.group(1).strip()
-
-    # Step 2: Clean the output file path
+    original_output = argv[output_idx + 1]
     clean_output_path = str(output_file).replace("'", "").replace('"', "")
-
-    # Step 3: Replace the output parameter
-    new_output_param = f'--output "{clean_output_path}"'
-    modified_cmd = handbrake_cmd.replace(f'--output {original_output}', new_output_param)
-
-    # Step 4: Clean up any remaining duplicate filename parts
-    # Split and filter out any parts that look like the original filename
-    parts = modified_cmd.split()
-    cleaned_parts = []
-    found_output_param = False
-
-    for i, part in enumerate(parts):
-        if part.startswith('--output'):
-            found_output_param = True
-            cleaned_parts.append(part)
-        elif found_output_param and part == original_output:
-            # This is the duplicate we want to remove
-            logging.debug(f"Removed duplicate filename: {part}")
-            continue
-        else:
-            cleaned_parts.append(part)
-
-    final_cmd = ' '.join(cleaned_parts)
+    argv[output_idx + 1] = clean_output_path
 
     logging.debug(f"🔧 Output path modification: '{original_output}' → '{clean_output_path}'")
-    if logging.getLogger().isEnabledFor(logging.DEBUG):
-        # Only show full commands in debug mode to avoid cluttering logs
-        logging.debug(f"🔧 Original HandBrakeCLI command: {handbrake_cmd}")
-        logging.debug(f"🔧 Modified HandBrakeCLI command: {final_cmd}")
-    else:
-        logging.debug("🔧 HandBrakeCLI command modified for output path")
 
-    # Step 5: Modify audio parameters for Dolby Atmos preservation
+    # Step 2: Route the video encoder to NVENC if configured (in-place edit,
+    # done before any inserts so the flag indexes stay valid)
+    if video_encoder_backend == 'nvenc':
+        apply_nvenc_encoder(argv, flag_idx)
+
+    # Step 3: Modify audio parameters for Dolby Atmos preservation
     if atmos_tracks:
         logging.info(f"🎵 Applying Dolby Atmos preservation to HandBrakeCLI command for tracks: {atmos_tracks}")
 
-        # Extract audio track count from the command
-        audio_match = re.search(r'--audio\s+([^-\s]+)', final_cmd)
-        if audio_match:
+        audio_idx = flag_idx.get('--audio')
+        if audio_idx is not None and audio_idx + 1 < len(argv):
             try:
-                audio_tracks_str = audio_match.group(1)
+                audio_tracks_str = argv[audio_idx + 1]
                 processed_tracks = [int(x) for x in audio_tracks_str.split(',')]
                 max_processed_track = max(processed_tracks)
                 logging.debug(f"🎵 Found {len(processed_tracks)} processed audio tracks: {audio_tracks_str}")
@@ -599,26 +738,22 @@ def modify_handbrake_output_path(handbrake_cmd, output_file, preview=False, atmo
                     # Generate proper audio parameters for relevant tracks, preserving original parameters for non-Atmos tracks
                     audio_params = generate_atmos_aware_audio_params(relevant_atmos_tracks, len(processed_tracks), handbrake_cmd)
 
-                    # Replace audio encoder
-                    if '--aencoder' in final_cmd:
-                        # Replace existing aencoder
-                        final_cmd = re.sub(r'--aencoder\s+[^-\s]+', f'--aencoder {audio_params["aencoder"]}', final_cmd)
-                    else:
-                        # Add aencoder if not present
-                        final_cmd = final_cmd.replace('--audio ', f'--audio {audio_tracks_str} --aencoder {audio_params["aencoder"]} ')
-
-                    # Replace or add bitrate parameters
-                    if audio_params['ab']:
-                        if '--ab' in final_cmd:
-                            final_cmd = re.sub(r'--ab\s+[^-\s]+', f'--ab {audio_params["ab"]}', final_cmd)
+                    # Replace existing flags in place; collect missing ones and
+                    # insert them after the --audio value in one splice
+                    pending = []
+                    for flag, value in (('--aencoder', audio_params['aencoder']),
+                                        ('--ab', audio_params['ab']),
+                                        ('--mixdown', audio_params['mixdown'])):
+                        if not value:
+                            continue
+                        idx = flag_idx.get(flag)
+                        if idx is not None and idx + 1 < len(argv):
+                            argv[idx + 1] = value
                         else:
-                            final_cmd = final_cmd.replace('--aencoder ', f'--aencoder {audio_params["aencoder"]} --ab {audio_params["ab"]} ')
-
-                    # Replace mixdown parameters
-                    if '--mixdown' in final_cmd:
-                        final_cmd = re.sub(r'--mixdown\s+[^-\s]+', f'--mixdown {audio_params["mixdown"]}', final_cmd)
-                    else:
-                        final_cmd = final_cmd.replace('--aencoder ', f'--aencoder {audio_params["aencoder"]} --mixdown {audio_params["mixdown"]} ')
+                            pending += [flag, value]
+                    if pending:
+                        insert_at = audio_idx + 2
+                        argv[insert_at:insert_at] = pending
 
                     logging.info("🎵 HandBrakeCLI audio parameters successfully modified for Atmos preservation")
                     logging.debug(f"🎵 New audio params: aencoder={audio_params['aencoder']}, ab={audio_params['ab']}, mixdown={audio_params['mixdown']}")
@@ -630,21 +765,49 @@ def modify_handbrake_output_path(handbrake_cmd, output_file, preview=False, atmo
         else:
             logging.warning("Could not determine audio track count for Atmos parameter generation")
 
-    # Step 6: Add preview option if requested
+    # Step 4: Add preview option if requested
     if preview and preview_parameter:
-        # Add preview parameter before the input file (which should be the last parameter)
-        final_cmd = final_cmd.rstrip() + f' {preview_parameter}'
+        argv.extend(shlex.split(preview_parameter))
+
+    final_cmd = shlex.join(argv)
+
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        # Only show full commands in debug mode to avoid cluttering logs
+        logging.debug(f"🔧 Original HandBrakeCLI command: {handbrake_cmd}")
+        logging.debug(f"🔧 Modified HandBrakeCLI command: {final_cmd}")
+    else:
+        logging.debug("🔧 HandBrakeCLI command modified for output path")
 
     return final_cmd
 
 
+def apply_nvenc_encoder(argv, flag_idx):
+    """Rewrites the video encoder in a HandBrakeCLI argv to its NVENC counterpart."""
+    encoder_idx = flag_idx.get('--encoder')
+    if encoder_idx is not None and encoder_idx + 1 < len(argv):
+        current_encoder = argv[encoder_idx + 1]
+        if current_encoder.startswith('nvenc'):
+            return
+        nvenc_encoder = NVENC_ENCODER_MAP.get(current_encoder)
+        if not nvenc_encoder:
+            logging.warning(f"No NVENC equivalent for encoder '{current_encoder}', keeping software encoder")
+            return
+        logging.info(f"🎬 Using NVENC hardware encoder: {current_encoder} → {nvenc_encoder}")
+        argv[encoder_idx + 1] = nvenc_encoder
+        return
+
+    # No explicit encoder means HandBrake's default (x264)
+    logging.info("🎬 Using NVENC hardware encoder: nvenc_h264")
+    argv.extend(['--encoder', 'nvenc_h264'])
+
+
 def get_installed_handbrake_version():
     """Get the installed HandBrakeCLI version."""
     try:
         # Run HandBrakeCLI with the --version option
         output = subprocess.check_output(["HandBrakeCLI", "--version"], text=True, stderr=subprocess.STDOUT)
         # Extract the version number using regular expression
-        matches = re.search(r"(\d+\.\d+\.\d+)", output)
+        matches = _VERSION_RE.search(output)
         if matches:
             return matches.group(1)
     except subprocess.CalledProcessError as e:
@@ -654,22 +817,18 @@ def get_installed_handbrake_version():
 
 def get_latest_handbrake_version():
     """Get the latest HandBrakeCLI version from the official website."""
+    import urllib.error
+    import urllib.request
+
     url = "https://handbrake.fr/downloads2.php"
     try:
-        response = requests.get(url)
-        soup = BeautifulSoup(response.content, "html.parser")
-        # Find all h2 elements on the page
-        h2_elements = soup.find_all("h2")
-        for h2_element in h2_elements:
-            # Check if the h2 element contains the text "Current Version"
-            if "Current Version" in h2_element.string:
-                # Extract the version number from the element text
-                version_pattern = r"(\d+\.\d+\.\d+)"
-                matches = re.search(version_pattern, h2_element.text)
-                if matches:
-                    logging.debug("Fetched HandBrakeCLI version: %s" % matches.group(1))
-                    return matches.group(1)
-    except requests.RequestException as e:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            html = response.read().decode('utf-8', 'replace')
+        matches = _LATEST_VERSION_RE.search(html)
+        if matches:
+            logging.debug("Fetched HandBrakeCLI version: %s" % matches.group(1))
+            return matches.group(1)
+    except (urllib.error.URLError, OSError) as e:
         print(f"Error while fetching the latest version of HandBrakeCLI: {e}")
     return None
 
@@ -685,82 +844,39 @@ def check_latest_handbrake_version(installed_version, latest_version):
 def detect_dolby_atmos(input_file):
     """Detect Dolby Atmos audio tracks and return track information."""
     try:
-        media_info = MediaInfo.parse(input_file)
+        mtime = _cached_stat(input_file).st_mtime
+    except OSError:
+        mtime = 0.0
+    return _detect_dolby_atmos_cached(os.fspath(input_file), mtime)
+
+@functools.lru_cache(maxsize=None)
+def _detect_dolby_atmos_cached(input_file, mtime):
+    """Cached Atmos probe; mtime keys the cache so edited files re-probe."""
+    try:
+        streams = probe(input_file).get('streams', [])
         atmos_tracks = []
 
         audio_track_counter = 0
-        for track in media_info.tracks:
-            if track.track_type == "Audio":
-                audio_track_counter += 1  # Increment audio track counter
-                # Safely get audio properties, defaulting to empty string if None
-                audio_format = (getattr(track, 'format', '') or '').lower()
-                audio_format_profile = (getattr(track, 'format_profile', '') or '').lower()
-                audio_title = (getattr(track, 'title', '') or '').lower()
-                audio_codec_id = (getattr(track, 'codec_id', '') or '').lower()
-                audio_format_info = (getattr(track, 'format_info', '') or '').lower()
-                audio_commercial_name = (getattr(track, 'commercial_name', '') or '').lower()
-
-                # Use audio track counter for proper parameter ordering (1, 2, 3, etc.)
-                track_number = audio_track_counter
-
-                # Extended Atmos indicators including JOC (Joint Object Coding)
-                atmos_indicators = [
-                    'atmos', 'dolby atmos', 'dolby-atmos',
-                    'dolby digital plus atmos', 'dd+ atmos',
-                    'truehd atmos', 'true-hd atmos'
-                ]
-
-                joc_indicators = [
-                    'joc', 'joint object coding', 'joint-object-coding',
-                    'enhanced ac-3 joc', 'e-ac-3 joc'
-                ]
-
-                # Check all fields for Atmos indicators
-                all_audio_fields = [
-                    audio_format_profile,
-                    audio_title,
-                    audio_format_info,
-                    audio_commercial_name,
-                    audio_codec_id
-                ]
-
-                is_atmos = False
-
-                # Check for Atmos in any field
-                for field_value in all_audio_fields:
-                    if any(indicator in field_value for indicator in atmos_indicators):
-                        logging.debug(f"🎵 Atmos detected in track {track_number}: {field_value}")
-                        is_atmos = True
-                        break
-
-                # Check for JOC (Joint Object Coding) which indicates Atmos
-                if not is_atmos:
-                    for field_value in all_audio_fields:
-                        if any(indicator in field_value for indicator in joc_indicators):
-                            logging.debug(f"🎵 Atmos detected via JOC in track {track_number}: {field_value}")
-                            is_atmos = True
-                            break
-
-                # Check for specific Atmos codec combinations
-                if not is_atmos and 'truehd' in audio_format and 'atmos' in audio_format_profile:
-                    logging.debug(f"🎵 Atmos detected in track {track_number}: TrueHD with Atmos profile")
-                    is_atmos = True
-
-                # Check for E-AC-3 JOC (Dolby Digital Plus with Atmos)
-                if not is_atmos and 'e-ac-3' in audio_format and any('joc' in field for field in all_audio_fields):
-                    logging.debug(f"🎵 Atmos detected in track {track_number}: E-AC-3 with JOC (Dolby Digital Plus Atmos)")
-                    is_atmos = True
-
-                # Check for Dolby Digital Plus with Atmos in commercial name
-                if not is_atmos and 'dolby digital plus with dolby atmos' in audio_commercial_name:
-                    logging.debug(f"🎵 Atmos detected in track {track_number}: Commercial name contains 'Dolby Digital Plus with Dolby Atmos'")
-                    is_atmos = True
-
-                if is_atmos:
-                    atmos_tracks.append(track_number)
-
-                # Debug logging for audio tracks (only in debug mode)
-                logging.debug(f"Audio track {track_number}: format={audio_format}, profile={audio_format_profile}, title={audio_title}, codec_id={audio_codec_id}, info={audio_format_info}, commercial={audio_commercial_name}, is_atmos={is_atmos}")
+        for stream in streams:
+            if stream.get('codec_type') != 'audio':
+                continue
+            audio_track_counter += 1  # Increment audio track counter
+
+            # Join all relevant fields into one lowercase blob and scan it
+            # with a single compiled alternation - one pass per track
+            tags = stream.get('tags') or {}
+            blob = ' '.join((stream.get('codec_name', ''),
+                             stream.get('profile', ''),
+                             stream.get('codec_long_name', ''),
+                             tags.get('title', ''))).lower()
+            is_atmos = _ATMOS_RE.search(blob) is not None
+
+            if is_atmos:
+                logging.debug(f"🎵 Atmos detected in track {audio_track_counter}")
+                atmos_tracks.append(audio_track_counter)
+
+            # Debug logging for audio tracks (only in debug mode)
+            logging.debug(f"Audio track {audio_track_counter}: {blob}, is_atmos={is_atmos}")
 
         return atmos_tracks if atmos_tracks else []
 
@@ -775,70 +891,59 @@ def detect_dolby_atmos(input_file):
 def generate_atmos_aware_audio_params(atmos_tracks, processed_audio_tracks, original_cmd):
     """Generate HandBrake audio parameters that preserve Atmos tracks while keeping original parameters for others."""
 
-    encoders = []
-    bitrates = []
-    mixdowns = []
-
     # Extract original audio parameters from the HandBrakeCLI command
     original_encoders = []
     original_bitrates = []
     original_mixdowns = []
 
     # Extract aencoder parameter
-    aencoder_match = re.search(r'--aencoder\s+([^-\s]+)', original_cmd)
+    aencoder_match = _AENC_RE.search(original_cmd)
     if aencoder_match:
         original_encoders = aencoder_match.group(1).split(',')
-        logging.debug(f"🎵 Original encoders: {original_encoders}")
+        logging.debug("🎵 Original encoders: %s", original_encoders)
 
     # Extract ab parameter
-    ab_match = re.search(r'--ab\s+([^-\s]+)', original_cmd)
+    ab_match = _AB_RE.search(original_cmd)
     if ab_match:
         original_bitrates = ab_match.group(1).split(',')
-        logging.debug(f"🎵 Original bitrates: {original_bitrates}")
+        logging.debug("🎵 Original bitrates: %s", original_bitrates)
 
     # Extract mixdown parameter
-    mixdown_match = re.search(r'--mixdown\s+([^-\s]+)', original_cmd)
+    mixdown_match = _MIX_RE.search(original_cmd)
     if mixdown_match:
         original_mixdowns = mixdown_match.group(1).split(',')
-        logging.debug(f"🎵 Original mixdowns: {original_mixdowns}")
+        logging.debug("🎵 Original mixdowns: %s", original_mixdowns)
+
+    # Preallocate the per-track lists and make track membership O(1)
+    atmos_track_set = frozenset(atmos_tracks)
+    encoders = [None] * processed_audio_tracks
+    bitrates = [None] * processed_audio_tracks
+    mixdowns = [None] * processed_audio_tracks
 
     # Process each track
     for i in range(1, processed_audio_tracks + 1):
-        if i in atmos_tracks:
+        track_index = i - 1  # Convert to 0-based index
+        if i in atmos_track_set:
             # Preserve Atmos track - use copy
-            encoders.append('copy')
-            bitrates.append('')  # No bitrate limit for Atmos
-            mixdowns.append('none')  # Preserve original channel layout
-            logging.debug(f"🎵 Track {i}: Atmos detected - using copy encoder")
+            encoders[track_index] = 'copy'
+            bitrates[track_index] = ''  # No bitrate limit for Atmos
+            mixdowns[track_index] = 'none'  # Preserve original channel layout
+            logging.debug("🎵 Track %d: Atmos detected - using copy encoder", i)
         else:
-            # Keep original parameters for non-Atmos tracks
-            track_index = i - 1  # Convert to 0-based index
-
-            # Get original encoder or default to av_aac
-            if track_index < len(original_encoders):
-                encoders.append(original_encoders[track_index])
-            else:
-                encoders.append('av_aac')
-
-            # Get original bitrate or default to empty (let HandBrake decide)
-            if track_index < len(original_bitrates):
-                bitrates.append(original_bitrates[track_index])
-            else:
-                bitrates.append('')
-
-            # Get original mixdown or default to 5point1
-            if track_index < len(original_mixdowns):
-                mixdowns.append(original_mixdowns[track_index])
-            else:
-                mixdowns.append('5point1')
-
-            logging.debug(f"🎵 Track {i}: Using original parameters - encoder: {encoders[-1]}, bitrate: {bitrates[-1]}, mixdown: {mixdowns[-1]}")
+            # Keep original parameters for non-Atmos tracks, with the usual
+            # HandBrake defaults when the original command had none
+            encoders[track_index] = original_encoders[track_index] if track_index < len(original_encoders) else 'av_aac'
+            bitrates[track_index] = original_bitrates[track_index] if track_index < len(original_bitrates) else ''
+            mixdowns[track_index] = original_mixdowns[track_index] if track_index < len(original_mixdowns) else '5point1'
+            logging.debug("🎵 Track %d: Using original parameters - encoder: %s, bitrate: %s, mixdown: %s",
+                          i, encoders[track_index], bitrates[track_index], mixdowns[track_index])
 
     encoder_param = ','.join(encoders)
     bitrate_param = ','.join(filter(None, bitrates))  # Remove empty strings
     mixdown_param = ','.join(mixdowns)
 
-    logging.debug(f"🎵 Generated audio parameters: encoders={encoder_param}, bitrates={bitrate_param}, mixdowns={mixdown_param}")
+    logging.debug("🎵 Generated audio parameters: encoders=%s, bitrates=%s, mixdowns=%s",
+                  encoder_param, bitrate_param, mixdown_param)
 
     params = {
         'aencoder': encoder_param,
@@ -853,127 +958,124 @@ def get_transcode_command(input_file, output_file, encode_type, preview):
     """Gets the transcode-video command without executing it."""
     # Preview option is handled in modify_handbrake_output_path, not here
 
-    # Determine parameters based on format
-    if encode_type == ENCODE_MOVIE:
-        format_params = encoding_parameters[ENCODE_MOVIE]
-    elif encode_type == ENCODE_TVSHOW:
-        format_params = encoding_parameters[ENCODE_TVSHOW]
-    else:
-        format_params = encoding_parameters[ENCODE_CUSTOM]
-
-    # Check for Dolby Atmos and log detection (only if enabled)
-    atmos_tracks = []
+    # Probe for Dolby Atmos once; the config only decides what happens with
+    # the result (preserve vs. inform)
+    atmos_tracks = detect_dolby_atmos(input_file)
     if preserve_atmos_audio:
-        atmos_tracks = detect_dolby_atmos(input_file)
         if atmos_tracks:
             logging.info(f"🎵 Dolby Atmos detected in tracks: {atmos_tracks}")
             logging.debug(f"🎵 Atmos tracks detected in file - will preserve codec during HandBrakeCLI processing")
     else:
-        # Check if there are Atmos tracks even when disabled, and inform user
-        potential_atmos_tracks = detect_dolby_atmos(input_file)
-        if potential_atmos_tracks:
-            logging.info(f"🎵 Dolby Atmos detected in tracks: {potential_atmos_tracks} (preservation disabled in config)")
+        if atmos_tracks:
+            logging.info(f"🎵 Dolby Atmos detected in tracks: {atmos_tracks} (preservation disabled in config)")
             logging.info("💡 Set 'preserve_atmos_audio = yes' in tvb-config.ini to enable Atmos preservation")
         else:
             logging.debug("🎵 No Dolby Atmos tracks detected in file")
         atmos_tracks = []  # Ensure no Atmos processing when disabled
 
-    arguments = f'{transcode_video_path} {format_params} --dry-run "{input_file}"'
-    return arguments, atmos_tracks
+    # Build the argv from the pretokenized prefix - no quote embedding and
+    # no per-file shlex round-trip, so paths containing quotes survive
+    # untouched
+    prefix = _PREBUILT_CMD.get(encode_type, _PREBUILT_CMD[ENCODE_CUSTOM])
+    return [*prefix, str(input_file)], atmos_tracks
+
+def _iter_lines_with_deadline(proc, deadline):
+    """Yields lines from proc.stdout until EOF or the wall-clock deadline passes.
+
+    A daemon reader thread feeds a queue on every platform: selecting on the
+    buffered stdout wrapper would miss lines the wrapper has already pulled
+    into its internal buffer, and select on pipes is POSIX-only anyway.
+    Lines already queued are still drained after the deadline passes.
+    """
+    import queue
 
-def process_file(input_file, output_dir, encode_type, preview, counter, file_count, dry_run=False):
+    lines = queue.Queue()
+
+    def _reader():
+        for line in proc.stdout:
+            lines.put(line)
+        lines.put(None)  # EOF marker
+
+    threading.Thread(target=_reader, daemon=True).start()
+    while True:
+        try:
+            line = lines.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            return
+        if line is None:
+            return
+        yield line
+
+def probe_file(input_file, output_file, encode_type, preview):
+    """Runs only the transcode-video dry-run and collects the commands.
+
+    Returns a tuple (transcode_cmd, hb_cmd, modified_cmd); the last two are
+    empty strings when no HandBrakeCLI command was found. Only reads
+    container metadata, so multiple probes can safely run in parallel.
+    """
+    transcode_cmd, atmos_tracks = get_transcode_command(input_file, output_file, encode_type, preview)
+
+    # readline() blocks until a line or EOF arrives, so iterating the
+    # stream needs no poll() spinning
+    proc = subprocess.Popen(transcode_cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True, encoding=get_platform_encoding())
+
+    hb_cmd = ""
+    modified_cmd = ""
+    for out in proc.stdout:
+        if 'HandBrakeCLI' in out:
+            hb_cmd = out.strip()
+            modified_cmd = modify_handbrake_output_path(hb_cmd, output_file, preview, atmos_tracks)
+            proc.terminate()
+            break
+    proc.wait()
+
+    return transcode_cmd, hb_cmd, modified_cmd
+
+def process_file(input_file, output_dir, encode_type, preview, counter, file_count):
     """Transcodes a video using transcode-video."""
-    output_file = Path(output_dir) / Path(input_file).name
-    
-    if not dry_run and output_file.exists():
+    # Compute the name and output path once; they are reused throughout
+    input_name = os.path.basename(input_file)
+    output_file = os.path.join(output_dir, input_name)
+
+    if os.path.exists(output_file):
         if preserve_file_date:
             set_target_date(input_file, output_file)
-            logging.info(f'Skipping {Path(input_file).name}, already exists...')
+            logging.info(f'Skipping {input_name}, already exists...')
             return
 
     progress = (counter / file_count) * 100
     progress = round(progress, 2)
 
-    logging.info(f'Processing: {Path(input_file).name}')
+    logging.info(f'Processing: {input_name}')
     logging.info(f'File {counter} of {file_count} - {progress}%')
 
     transcode_cmd, atmos_tracks = get_transcode_command(input_file, output_file, encode_type, preview)
-    logging.debug(f"transcode-video command: {transcode_cmd}")
-
-    if dry_run:
-        print(f"\n🔍 DRY-RUN for: {Path(input_file).name}")
-        print(f"📋 transcode-video command:")
-        print(f"   {transcode_cmd}")
-        
-        # Execute only the dry-run to see the HandBrakeCLI command
-        args = shlex.split(transcode_cmd)
-        proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True, encoding=get_platform_encoding())
-        
-        gethbCmd = ""
-        while True:
-            retcode = proc.poll()
-            try:
-                out = proc.stdout.readline()
-                if 'HandBrakeCLI' in out:
-                    gethbCmd = out.strip()
-                    print(f"🔧 HandBrakeCLI command (Original):")
-                    print(f"   {gethbCmd}")
-                    
-                    # Show the modified command as well
-                    modified_cmd = modify_handbrake_output_path(gethbCmd, output_file, preview, atmos_tracks)
-                    print(f"🔧 HandBrakeCLI command (with output path):")
-                    print(f"   {modified_cmd}")
-                    break
-            except:
-                pass
-            if retcode is not None:
-                break
-        
-        if not gethbCmd:
-            print(f"⚠️  No HandBrakeCLI command found!")
-        
-        print("-" * 80)
-        return
+    logging.debug(f"transcode-video command: {shlex.join(transcode_cmd)}")
 
     # Normal transcoding
-    args = shlex.split(transcode_cmd)
-    
     # First phase: Dry-run to get the HandBrakeCLI command
     logging.info("Starting transcode-video dry-run to get HandBrakeCLI command...")
-    proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True, encoding=get_platform_encoding())
+    proc = subprocess.Popen(transcode_cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True, encoding=get_platform_encoding())
 
     gethbCmd = ""
-    timeout_counter = 0
-    max_timeout = 30  # 30 seconds timeout
-    
-    while True:
-        retcode = proc.poll()
-        try:
-            out = proc.stdout.readline()
-            if out:
-                logging.debug(f"transcode-video output: {out.strip()}")
-                if 'HandBrakeCLI' in out:
-                    gethbCmd = out.strip()
-                    logging.info("Found HandBrakeCLI command in transcode-video output")
-                    break
-        except Exception as e:
-            logging.error(f"Error reading transcode-video output: {e}")
-            break
-        
-        if retcode is not None:
-            logging.info(f"transcode-video process finished with return code: {retcode}")
-            break
-            
-        timeout_counter += 1
-        if timeout_counter > max_timeout:
-            logging.error("Timeout waiting for HandBrakeCLI command from transcode-video")
-            proc.terminate()
+    deadline = time.monotonic() + 30.0  # the dry-run only reads metadata, 30s is plenty
+
+    for out in _iter_lines_with_deadline(proc, deadline):
+        logging.debug(f"transcode-video output: {out.strip()}")
+        if 'HandBrakeCLI' in out:
+            gethbCmd = out.strip()
+            logging.info("Found HandBrakeCLI command in transcode-video output")
             break
 
+    if not gethbCmd and proc.poll() is None:
+        logging.error("Timeout waiting for HandBrakeCLI command from transcode-video")
+    proc.terminate()
+    proc.wait()
+
     logging.debug(f'Command from transcode-video: {gethbCmd}')
 
     if not gethbCmd:
-        logging.error(f'Failed to get HandBrakeCLI command for: {Path(input_file).name}')
+        logging.error(f'Failed to get HandBrakeCLI command for: {input_name}')
         return
 
     # Modify the HandBrakeCLI command to use our desired output path
@@ -982,21 +1084,21 @@ def process_file(input_file, output_dir, encode_type, preview, counter, file_cou
     logging.debug(f'Final HandBrakeCLI command: {hbCmd}')
 
     # Second phase: Actual transcoding
-    if cpu_limit_enabled:
-        hbCmd = f'cpulimit --limit={cpu_limit_percentage} -i -z {hbCmd}'
-    
     hbCmd = shlex.split(hbCmd)
-    
+    if cpu_limit_enabled:
+        hbCmd = ['cpulimit', f'--limit={cpu_limit_percentage}', '-i', '-z'] + hbCmd
+
+
     try:
         proc = subprocess.Popen(hbCmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True, encoding=get_platform_encoding())
     except Exception as e:
-        logging.error(f'Encoding failed -> {Path(input_file).name}, {e}')
+        logging.error(f'Encoding failed -> {input_name}, {e}')
         return
 
     start_time = time.time()
 
     # Create descriptive progress bar with file name and batch progress
-    file_name = Path(input_file).name
+    file_name = input_name
     batch_progress = f"File {counter} of {file_count}"
 
     # Truncate filename if too long, but keep it informative
@@ -1022,18 +1124,30 @@ def process_file(input_file, output_dir, encode_type, preview, counter, file_cou
     print(f"🎬 Encoding: {display_name}")
     print("-" * terminal_columns)
 
+    from tqdm import tqdm
+
     bar_length = terminal_columns - 45
     tqdm_bar = tqdm(total=100,
                     desc="Progress",
                     bar_format='{desc}: {percentage:3.0f}%|{bar:' + str(bar_length) + '}{postfix}',
                     ncols=terminal_columns)
-    while proc.poll() is None:
-        out = proc.stdout.readline()
-        matches = re.match(r'.*\s(\d+\.\d+)\s%.*avg\s(\d+\.\d+).*ETA\s(\d+)h(\d+)m(\d+)s', out)
+    # Iterate until EOF instead of polling; readline blocks on its own
+    last_post = None
+    for out in iter(proc.stdout.readline, ''):
+        # Fast C-level substring test filters the common non-progress lines
+        # before paying for the regex
+        if 'ETA' not in out:
+            continue
+        matches = _HB_PROGRESS_RE.search(out)
         if matches:
             tqdm_bar.update(int(float(matches.group(1))) - tqdm_bar.n)
-            tqdm_bar.set_postfix_str(f"avg {matches.group(2)} fps, ETA {matches.group(3)}h{matches.group(4)}m{matches.group(5)}s")
-            tqdm_bar.refresh()
+            # Only rebuild the postfix when fps/ETA actually changed and let
+            # tqdm's own mininterval throttle the terminal redraws
+            post = matches.group(2, 3, 4, 5)
+            if post != last_post:
+                tqdm_bar.set_postfix_str(f"avg {post[0]} fps, ETA {post[1]}h{post[2]}m{post[3]}s")
+                last_post = post
+    proc.wait()
     tqdm_bar.close()
 
     # Print completion message
@@ -1042,10 +1156,17 @@ def process_file(input_file, output_dir, encode_type, preview, counter, file_cou
     print(f"⏱️  Encoding time: {time.strftime('%H:%M:%S', time.gmtime(elapsed_time))}")
     print("=" * terminal_columns)
 
-    # Post-processing
-    if os.path.exists(output_file):
-        original_size = Filesize(os.path.getsize(input_file))
-        new_size = Filesize(os.path.getsize(output_file))
+    # Post-processing - one stat per file instead of exists + repeated getsize
+    try:
+        out_stat = os.stat(output_file)
+    except FileNotFoundError:
+        out_stat = None
+
+    if out_stat is not None:
+        orig_bytes = _cached_stat(input_file).st_size
+        new_bytes = out_stat.st_size
+        original_size = Filesize(orig_bytes)
+        new_size = Filesize(new_bytes)
         logging.info(f'Original/New file size: {original_size}/{new_size}')
         
         # Edit subtitles (only if manually activated)
@@ -1061,44 +1182,6 @@ def process_file(input_file, output_dir, encode_type, preview, counter, file_cou
         elapsed_time_formatted = time.strftime("%H:%M:%S", time.gmtime(elapsed_time))
         logging.info(f'Elapsed time: {elapsed_time_formatted}')
         
-        # Set locale based on configuration
-        # Try to use the configured locale, fallback to system default if not available
-        locale_set = False
-        if hasattr(locals(), 'localization') and localization and localization.lower() != 'default':
-            # Use the local variable if it exists
-            loc_setting = localization
-        elif 'localization' in globals():
-            # Use the global variable
-            loc_setting = globals()['localization']
-        else:
-            # Default fallback
-            loc_setting = 'en_US'
-
-        if loc_setting and loc_setting.lower() != 'default':
-            # Try different variations of the locale string
-            locale_variations = [
-                loc_setting,
-                f"{loc_setting}.UTF-8",
-                f"{loc_setting}.utf8",
-                loc_setting.replace('-', '_'),
-                f"{loc_setting.replace('-', '_')}.UTF-8"
-            ]
-
-            for loc in locale_variations:
-                try:
-                    locale.setlocale(locale.LC_ALL, loc)
-                    logging.debug(f"Successfully set locale to: {loc}")
-                    locale_set = True
-                    break
-                except locale.Error:
-                    continue
-
-            if not locale_set:
-                logging.debug(f"Locale '{loc_setting}' not available, using system default")
-                locale.setlocale(locale.LC_ALL, '')
-        else:
-            locale.setlocale(locale.LC_ALL, '')
-
         # Use strftime with current locale settings
         # This will automatically format dates according to the locale
         try:
@@ -1106,16 +1189,55 @@ def process_file(input_file, output_dir, encode_type, preview, counter, file_cou
         except (ValueError, OSError):
             # Fallback if locale formatting fails
             now = datetime.today().strftime('%Y-%m-%d %H:%M:%S')
-        percent_val = '{:.2%}'.format(os.path.getsize(output_file) / os.path.getsize(input_file))
-        stats_data = [now, Path(input_file).name, original_size, new_size, percent_val, elapsed_time_formatted, gethbCmd]
+        percent_val = '{:.2%}'.format(new_bytes / orig_bytes)
+        stats_data = [now, input_name, original_size, new_size, percent_val, elapsed_time_formatted, gethbCmd]
         write_statistics(stats_data)
 
         if preserve_file_date:
             set_target_date(input_file, output_file)
 
+def run_batch(jobs, output_dir, preview, max_workers=1):
+    """Dispatches the transcode jobs, optionally through a bounded worker pool.
+
+    Each worker only supervises the external HandBrakeCLI process (which does
+    the actual CPU work), so threads are sufficient here - the GIL is released
+    while waiting on the child. With max_workers=1 the batch runs sequentially
+    exactly as before.
+    """
+    file_count = len(jobs)
+
+    if max_workers <= 1:
+        for counter, (input_file, encode_type) in enumerate(jobs, 1):
+            process_file(input_file, output_dir, encode_type, preview, counter, file_count)
+        return
+
+    max_workers = min(max_workers, os.cpu_count() or 1, file_count)
+    logging.info(f"Running batch with {max_workers} parallel encodes")
+
+    # Group jobs by source file so one worker handles all outputs of a
+    # source sequentially: two workers never read the same file at once and
+    # per-source probe results stay warm within the worker.
+    groups = {}
+    for counter, (input_file, encode_type) in enumerate(jobs, 1):
+        groups.setdefault(input_file, []).append((counter, input_file, encode_type))
+
+    def _run_group(group_jobs):
+        for counter, input_file, encode_type in group_jobs:
+            process_file(input_file, output_dir, encode_type, preview, counter, file_count)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_run_group, group_jobs): source
+                   for source, group_jobs in groups.items()}
+
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                logging.error(f'Encoding failed -> {Path(futures[future]).name}, {e}')
+
 def find_videos_in_directory(input_dir):
     """Finds all video files in a directory."""
-    return [str(file) for file in Path(input_dir).rglob("*") if file.suffix.lower() in VIDEO_EXTENSIONS]
+    return list(_walk_video_files(input_dir))
 
 def parse_args():
     """Parses command line arguments."""
@@ -1139,6 +1261,8 @@ def parse_args():
                         help='Create preview (optional, default is 30 seconds)')
     parser.add_argument('-d', '--dry-run', action='store_true',
                         help='Show HandBrakeCLI commands without executing (dry run)')
+    parser.add_argument('--check-update', action='store_true',
+                        help='Check online whether a newer HandBrakeCLI version is available')
     parser.add_argument('--version', action='version',
                         version=f'%(prog)s {__version__}')
     parser.add_argument('-v', '--verbose', action='store_true',
@@ -1152,21 +1276,23 @@ def main():
     """Main program."""
     args = parse_args()
     setup_logging(verbose=args.verbose, debug=getattr(args, 'debug', False))
-    
+    _init_locale_once()
+
     logging.info(f"Running {__appname__} version {__version__}")
 
-    # Check HandBrakeCLI version
-    latest_version = get_latest_handbrake_version()
-    logging.info(f"Latest HandBrakeCLI version: {latest_version}")
-    if latest_version:
-        installed_version = get_installed_handbrake_version()
-        logging.info(f"Installed HandBrakeCLI version: {installed_version}")
-        if installed_version:
-            check_latest_handbrake_version(installed_version, latest_version)
+    # Check HandBrakeCLI version (network fetch, only when requested)
+    if args.check_update:
+        latest_version = get_latest_handbrake_version()
+        logging.info(f"Latest HandBrakeCLI version: {latest_version}")
+        if latest_version:
+            installed_version = get_installed_handbrake_version()
+            logging.info(f"Installed HandBrakeCLI version: {installed_version}")
+            if installed_version:
+                check_latest_handbrake_version(installed_version, latest_version)
+            else:
+                print("HandBrakeCLI is not installed or an error occurred while checking the version.")
         else:
-            print("HandBrakeCLI is not installed or an error occurred while checking the version.")
-    else:
-        print("Failed to fetch the latest version of HandBrakeCLI.")
+            print("Failed to fetch the latest version of HandBrakeCLI.")
 
     # Debug: Show found tools
     logging.info("🔍 Tool search completed:")
@@ -1249,18 +1375,35 @@ def main():
         print(f'🎯 Output: {args.output}')
         print('-' * terminal_columns)
 
-    counter = 0
-    
-    for line in encode_list.processed_list:
-        counter += 1
-        input_file = line[0]
-        encode_type = line[1]
-        
-        if args.merge:
-            if not args.dry_run:
-                merge_file(input_file, args.output)
-        else:
-            process_file(input_file, args.output, encode_type, args.preview, counter, file_count, args.dry_run)
+    if args.merge:
+        if not args.dry_run:
+            for line in encode_list.processed_list:
+                merge_file(line[0], args.output)
+    elif args.dry_run:
+        # Each probe mostly blocks on a transcode-video subprocess reading
+        # container metadata; the probes are independent, so run them in
+        # parallel and print the results in list order afterwards.
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            results = list(executor.map(
+                lambda line: probe_file(line[0], Path(args.output) / Path(line[0]).name,
+                                        line[1], args.preview),
+                encode_list.processed_list))
+
+        for line, (transcode_cmd, hb_cmd, modified_cmd) in zip(encode_list.processed_list, results):
+            print(f"\n🔍 DRY-RUN for: {Path(line[0]).name}")
+            print(f"📋 transcode-video command:")
+            print(f"   {shlex.join(transcode_cmd)}")
+            if hb_cmd:
+                print(f"🔧 HandBrakeCLI command (Original):")
+                print(f"   {hb_cmd}")
+                print(f"🔧 HandBrakeCLI command (with output path):")
+                print(f"   {modified_cmd}")
+            else:
+                print(f"⚠️  No HandBrakeCLI command found!")
+            print("-" * 80)
+    else:
+        run_batch(encode_list.processed_list, args.output, args.preview,
+                  max_workers=max_concurrent_encodes)
 
     # Print final summary (only for actual encoding, not dry-run)
     if not args.dry_run and file_count > 0:
@@ -1270,13 +1413,15 @@ def main():
         print(f'✅ Processed: {file_count} video file(s)')
         print(f'📁 Output: {args.output}')
 
-        # Count successfully created files
-        successful_files = 0
-        for line in encode_list.processed_list:
-            input_file = line[0]
-            output_file = os.path.join(args.output, os.path.basename(input_file))
-            if os.path.exists(output_file):
-                successful_files += 1
+        # Count successfully created files - one scan of the output
+        # directory answers all membership queries
+        try:
+            with os.scandir(args.output) as it:
+                present = {entry.name for entry in it if entry.is_file()}
+        except OSError:
+            present = set()
+        successful_files = sum(1 for line in encode_list.processed_list
+                               if os.path.basename(line[0]) in present)
 
         print(f'📈 Success rate: {successful_files}/{file_count} files')
         print('=' * terminal_columns)